@@ -18,28 +18,40 @@ Config:
 - Sample config:
 {
   "credentials_file": "credentials.json",
-  "token_file": "token.pickle",
+  "token_file": "token.json",
   "scopes": ["https://www.googleapis.com/auth/drive.readonly"],
   "exclusion_suffixes": ["_backup", "_copy", "_old"],
-  "download_folder": "./downloads"
+  "download_folder": "./downloads",
+  "search_workers": 5,
+  "download_workers": 8,
+  "cache_file": "search_cache.sqlite",
+  "cache_ttl_seconds": 86400
 }
 """
 
+from __future__ import annotations
+
+import csv
 import io
 import json
 import os
-import pickle
 import re
-from collections import defaultdict
+import sqlite3
+import threading
+import time
+import zipfile
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-import pandas as pd
 import streamlit as st
-from google.auth.transport.requests import Request
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
+
+# pandas, openpyxl and the Google client libraries are imported where they
+# are used so the Streamlit UI renders before they are loaded.
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 # ---------------------------
@@ -58,10 +70,15 @@ def load_config() -> Dict:
         cfg = json.load(f)
 
     cfg.setdefault("credentials_file", "credentials.json")
-    cfg.setdefault("token_file", "token.pickle")
+    cfg.setdefault("token_file", "token.json")
     cfg.setdefault("scopes", ["https://www.googleapis.com/auth/drive.readonly"])
     cfg.setdefault("exclusion_suffixes", ["_backup", "_copy", "_old"])
+    cfg["exclusion_suffixes"] = tuple(s.lower() for s in cfg["exclusion_suffixes"])
     cfg.setdefault("download_folder", "./downloads")
+    cfg.setdefault("search_workers", 5)
+    cfg.setdefault("download_workers", 8)
+    cfg.setdefault("cache_file", "search_cache.sqlite")
+    cfg.setdefault("cache_ttl_seconds", 86400)
     return cfg
 
 
@@ -71,13 +88,17 @@ def load_config() -> Dict:
 
 def get_credentials(token_file: str, credentials_file: str, scopes: List[str]):
     """Return Google Credentials object using token file and credentials file."""
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     creds = None
     token_path = Path(token_file)
 
     if token_path.exists():
         try:
-            with token_path.open("rb") as token:
-                creds = pickle.load(token)
+            with token_path.open("r", encoding="utf-8") as token:
+                creds = Credentials.from_authorized_user_info(json.load(token), scopes)
         except Exception:
             creds = None
 
@@ -90,15 +111,58 @@ def get_credentials(token_file: str, credentials_file: str, scopes: List[str]):
     if not creds:
         flow = InstalledAppFlow.from_client_secrets_file(credentials_file, scopes)
         creds = flow.run_local_server(port=0)
-        with token_path.open("wb") as token:
-            pickle.dump(creds, token)
+        with token_path.open("w", encoding="utf-8") as token:
+            token.write(creds.to_json())
 
     return creds
 
 
 def build_drive_service(creds):
     """Build and return Google Drive API service."""
-    return build("drive", "v3", credentials=creds)
+    from googleapiclient.discovery import build
+
+    return build("drive", "v3", credentials=creds, cache_discovery=False)
+
+
+class DriveServicePool:
+    """
+    Reusable Drive services built from one set of credentials.
+    googleapiclient's Http objects are not thread-safe, so each service is
+    lent to one worker thread at a time and returned to the pool afterwards.
+    """
+
+    def __init__(self, creds):
+        self.creds = creds
+        self._idle: List[object] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def service(self) -> Iterator[object]:
+        with self._lock:
+            service = self._idle.pop() if self._idle else None
+        if service is None:
+            service = build_drive_service(self.creds)
+        try:
+            yield service
+        finally:
+            with self._lock:
+                self._idle.append(service)
+
+
+@st.cache_resource(show_spinner=False)
+def get_drive_services(
+    token_file: str,
+    credentials_file: str,
+    scopes: Tuple[str, ...],
+    token_mtime: Optional[float] = None
+) -> DriveServicePool:
+    """
+    Return a DriveServicePool reused across Streamlit reruns, so worker
+    services are only built once per session.
+    scopes must be a tuple so the arguments are hashable; token_mtime makes
+    an edited or replaced token file produce a fresh pool.
+    """
+    return DriveServicePool(get_credentials(token_file, credentials_file, list(scopes)))
 
 
 # ---------------------------
@@ -110,6 +174,35 @@ def ensure_folder(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+_COUNTER_RE = re.compile(r"\s*\(\d+\)\s*$")
+
+
+def split_name(name: str) -> Tuple[str, str]:
+    """Split a filename into (stem, extension) like Path.stem/Path.suffix, without pathlib."""
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[:i], name[i:]
+    return name, ""
+
+
+def split_normalized_names(names: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Vectorized normalize_filename(split_name(name)[0]) and split_name(name)[1].lower()
+    for a Series of filenames; returns (normalized stems, lowercased extensions).
+    """
+    names = names.fillna("").astype(str).str.strip()
+    parts = names.str.extract(r"(?s)^(.+)(\.[^.]+)$")
+    stems = parts[0].fillna(names)
+    exts = parts[1].fillna("").str.lower()
+    norms = (
+        stems.str.strip()
+        .str.replace(_COUNTER_RE.pattern, "", regex=True)
+        .str.strip()
+        .str.lower()
+    )
+    return norms, exts
+
+
 def normalize_filename(name: str) -> str:
     """
     Normalize filename stem for matching:
@@ -119,14 +212,13 @@ def normalize_filename(name: str) -> str:
     """
     if not isinstance(name, str):
         return ""
-    name = re.sub(r"\s*\(\d+\)\s*$", "", name.strip())
+    name = _COUNTER_RE.sub("", name.strip())
     return name.strip().lower()
 
 
-def should_exclude(name_no_ext: str, exclusion_suffixes: List[str]) -> bool:
-    """Return True if the stem ends with any excluded suffix."""
-    stem = (name_no_ext or "").lower()
-    return any(stem.endswith(suf.lower()) for suf in exclusion_suffixes)
+def should_exclude(name_no_ext: str, exclusion_suffixes: Tuple[str, ...]) -> bool:
+    """Return True if the stem ends with any excluded suffix (suffixes must be lowercase)."""
+    return (name_no_ext or "").lower().endswith(exclusion_suffixes)
 
 
 def sanitize_sheet_name(name: str) -> str:
@@ -143,77 +235,316 @@ def sanitize_folder_name(name: str) -> str:
 
 
 # ---------------------------
-# Drive Search Helpers
+# Search Cache
 # ---------------------------
 
-def drive_search_by_name(service, filename: str, max_results: int = 20) -> List[Dict]:
+class SearchCache:
     """
-    Search Drive files by name.
-    Uses the stem if extension is present so matching is broader.
+    Drive search results keyed by normalized filename stem, stored in a SQLite
+    file and expiring after ttl_seconds. A ttl of 0 or less disables caching.
+    The cache is optional: any SQLite error is treated as a miss (reads) or
+    ignored (writes), and a file that cannot be opened disables the cache.
+    With refresh=True nothing is read, but fresh results are still stored.
     """
-    filename = filename.strip()
-    stem = Path(filename).stem if Path(filename).suffix else filename
-    safe = stem.replace('"', '\\"')
+
+    def __init__(self, path: str, ttl_seconds: float, refresh: bool = False):
+        self.path = Path(path)
+        self.ttl = float(ttl_seconds)
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        if self.enabled:
+            try:
+                with self._connect() as conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS search_cache ("
+                        "norm_name TEXT PRIMARY KEY, fetched_at REAL, payload BLOB)"
+                    )
+            except sqlite3.Error:
+                self.ttl = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[Dict]]:
+        """Return cached candidates for the search keys that have a fresh entry."""
+        if not self.enabled or self.refresh or not keys:
+            return {}
+
+        cutoff = time.time() - self.ttl
+        hits: Dict[str, List[Dict]] = {}
+        try:
+            with self._connect() as conn:
+                for key in set(keys):
+                    row = conn.execute(
+                        "SELECT payload FROM search_cache "
+                        "WHERE norm_name = ? AND fetched_at >= ?",
+                        (key, cutoff),
+                    ).fetchone()
+                    if row:
+                        hits[key] = json.loads(row[0])
+        except (sqlite3.Error, ValueError):
+            return {}
+
+        return hits
+
+    def put_many(self, by_key: Dict[str, List[Dict]]) -> None:
+        """Store candidates for each search key."""
+        if not self.enabled or not by_key:
+            return
+
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO search_cache (norm_name, fetched_at, payload) "
+                    "VALUES (?, ?, ?)",
+                    [(key, now, json.dumps(files)) for key, files in by_key.items()],
+                )
+        except sqlite3.Error:
+            pass
+
+
+# ---------------------------
+# Drive Search Helpers
+# ---------------------------
+
+SEARCH_BATCH_SIZE = 25
+DRIVE_BATCH_LIMIT = 100
+UNSAFE_QUERY_CHARS = frozenset("\"'()\\")
+MAX_CANDIDATES_PER_NAME = 20
+
+
+def escape_query_value(value: str) -> str:
+    """Escape a value for use inside a double-quoted Drive query string."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def name_search_request(service, term: str, max_results: int = MAX_CANDIDATES_PER_NAME):
+    """Build (without executing) the files.list request for a single search term."""
+    safe = escape_query_value(term)
 
     query = f'name contains "{safe}" and trashed = false'
-    results = service.files().list(
+    return service.files().list(
         q=query,
         spaces="drive",
-        fields="files(id, name, mimeType, size, webViewLink)",
+        fields="files(id, name, mimeType, webViewLink)",
         pageSize=max_results
-    ).execute()
+    )
+
 
-    return results.get("files", [])
+def is_or_groupable(term: str) -> bool:
+    """Return True if the search term can be safely combined into an OR-grouped query."""
+    return not any(c in UNSAFE_QUERY_CHARS for c in term)
 
 
-def best_match_from_candidates(
-    filename: str,
-    candidates: List[Dict],
-    exclusion_suffixes: List[str]
-) -> Optional[Dict]:
+def drive_search_by_names(
+    service,
+    terms: List[str],
+    page_size: int = 1000
+) -> Tuple[List[Dict], bool]:
     """
-    Select best match from candidates:
-    1. exact stem + extension match
-    2. exact stem match
-    3. first non-excluded candidate
-    4. first candidate
+    Search Drive for several search terms with a single OR-grouped query.
+    Follows nextPageToken until MAX_CANDIDATES_PER_NAME files per term have
+    been fetched, so one generic term cannot page through the whole Drive.
+    Returns (files, truncated); truncated is True if more pages were left.
+    """
+    clauses = [f'name contains "{escape_query_value(term)}"' for term in sorted(set(terms)) if term]
+    if not clauses:
+        return [], False
+
+    query = f'({" or ".join(clauses)}) and trashed = false'
+    limit = MAX_CANDIDATES_PER_NAME * len(clauses)
+    files: List[Dict] = []
+    page_token = None
+    while len(files) < limit:
+        results = service.files().list(
+            q=query,
+            spaces="drive",
+            fields="nextPageToken, files(id, name, mimeType, webViewLink)",
+            pageSize=min(page_size, limit - len(files)),
+            pageToken=page_token,
+        ).execute()
+        files.extend(results.get("files", []))
+        page_token = results.get("nextPageToken")
+        if not page_token:
+            break
+    return files[:limit], bool(page_token) or len(files) > limit
+
+
+def drive_search_batch(service, terms: List[str]) -> Dict[str, Tuple[List[Dict], str]]:
+    """
+    Search Drive for each term separately, sending up to DRIVE_BATCH_LIMIT
+    files.list calls per HTTP batch request.
+    Returns {term: (candidates, error_message)}.
     """
-    if not candidates:
-        return None
+    unique = list(dict.fromkeys(terms))
+    out: Dict[str, Tuple[List[Dict], str]] = {}
 
-    target_stem = normalize_filename(Path(filename).stem)
-    target_ext = Path(filename).suffix.lower()
+    def store(request_id, response, exception):
+        name = unique[int(request_id)]
+        if exception is not None:
+            out[name] = ([], str(exception))
+        else:
+            out[name] = (response.get("files", []), "")
 
-    # 1) Exact stem + extension match
-    for c in candidates:
-        c_name = c.get("name", "")
-        c_stem = normalize_filename(Path(c_name).stem)
-        c_ext = Path(c_name).suffix.lower()
-        if c_stem == target_stem and c_ext == target_ext:
-            return c
+    for start in range(0, len(unique), DRIVE_BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=store)
+        for idx in range(start, min(start + DRIVE_BATCH_LIMIT, len(unique))):
+            batch.add(name_search_request(service, unique[idx]), request_id=str(idx))
+        batch.execute()
+
+    return out
+
+
+def search_candidates(
+    service,
+    keys: List[str],
+    cache: Optional[SearchCache] = None
+) -> Dict[str, Tuple[List[Dict], str]]:
+    """
+    Return {key: (candidates, error_message)} for the given search keys.
+    Cached keys are served from cache; of the rest, safe keys share one
+    OR-grouped query and keys with quotes, parentheses or backslashes are
+    searched individually through a batch request. If the OR-grouped results
+    were cut off, keys left with fewer than MAX_CANDIDATES_PER_NAME files are
+    searched again individually, since a generic key may have used up the
+    shared result budget.
+    """
+    out: Dict[str, Tuple[List[Dict], str]] = {}
+    if cache is not None:
+        out.update({key: (files, "") for key, files in cache.get_many(keys).items()})
+
+    pending = [key for key in keys if key not in out]
+    grouped = [key for key in pending if is_or_groupable(key)]
+    single = [key for key in pending if not is_or_groupable(key)]
+    # keys whose OR-grouped results were cut off must not be cached
+    partial = set()
+
+    if grouped:
+        try:
+            files, truncated = drive_search_by_names(service, grouped)
+            buckets = bucket_candidates(grouped, files)
+            out.update({name: (files, "") for name, files in buckets.items()})
+            if truncated:
+                partial.update(grouped)
+                single.extend(
+                    key for key, files in buckets.items()
+                    if key and len(files) < MAX_CANDIDATES_PER_NAME
+                )
+        except Exception as e:
+            out.update({name: ([], str(e)) for name in grouped})
+
+    if single:
+        try:
+            out.update(drive_search_batch(service, single))
+            partial.difference_update(single)
+        except Exception as e:
+            out.update({name: ([], str(e)) for name in single})
+
+    if cache is not None:
+        # empty results are not cached so newly uploaded files show up on the next run
+        cache.put_many({
+            key: out[key][0] for key in pending
+            if out[key][0] and not out[key][1] and key not in partial
+        })
+
+    return out
+
+
+def word_prefix_pattern(key: str) -> re.Pattern:
+    """
+    Match key where Drive's `name contains` would: at the start of a word
+    (Drive only does prefix matching on name terms, so "port" does not
+    match "report").
+    """
+    return re.compile(r"(?<![^\W_])" + re.escape(key))
+
+
+def bucket_candidates(keys: List[str], files: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    Assign each Drive file to every search key that starts a word in its
+    lowercased name, keeping at most MAX_CANDIDATES_PER_NAME files per key.
+    """
+    buckets: Dict[str, List[Dict]] = {key: [] for key in keys}
+    patterns = {key: word_prefix_pattern(key) for key in buckets if key}
+    for f in files:
+        if not patterns:
+            break
+        haystack = f.get("name", "").lower()
+        for key, pattern in patterns.items():
+            if pattern.search(haystack):
+                buckets[key].append(f)
+        patterns = {
+            key: pattern for key, pattern in patterns.items()
+            if len(buckets[key]) < MAX_CANDIDATES_PER_NAME
+        }
+    return buckets
 
-    # 2) Exact stem match
-    for c in candidates:
-        c_name = c.get("name", "")
-        c_stem = normalize_filename(Path(c_name).stem)
-        if c_stem == target_stem:
-            return c
 
-    # 3) First non-excluded candidate
+class CandidateIndex(NamedTuple):
+    """Drive candidates indexed for best_match_for_target."""
+    by_stem_ext: Dict[Tuple[str, str], Dict]
+    by_stem: Dict[str, Dict]
+    first_non_excluded: Optional[Dict]
+    first: Optional[Dict]
+
+
+def index_candidates(candidates: List[Dict], exclusion_suffixes: Tuple[str, ...]) -> CandidateIndex:
+    """
+    Index candidates by normalized stem (+ extension) in a single pass.
+    The first candidate wins for each key, so best_match_for_target keeps
+    the "first match" order of the candidate list.
+    exclusion_suffixes must be lowercase (load_config takes care of this).
+    """
+    by_stem_ext: Dict[Tuple[str, str], Dict] = {}
+    by_stem: Dict[str, Dict] = {}
+    first_non_excluded = None
+
     for c in candidates:
-        c_name = c.get("name", "")
-        c_stem = normalize_filename(Path(c_name).stem)
-        if not should_exclude(c_stem, exclusion_suffixes):
-            return c
+        c_stem, c_ext = split_name(c.get("name", ""))
+        c_stem = normalize_filename(c_stem)
+        by_stem_ext.setdefault((c_stem, c_ext.lower()), c)
+        by_stem.setdefault(c_stem, c)
+        if first_non_excluded is None and not should_exclude(c_stem, exclusion_suffixes):
+            first_non_excluded = c
+
+    return CandidateIndex(
+        by_stem_ext, by_stem, first_non_excluded, candidates[0] if candidates else None
+    )
 
-    # 4) Fallback
-    return candidates[0]
+
+def best_match_for_target(target_stem: str, target_ext: str, index: CandidateIndex) -> Optional[Dict]:
+    """
+    Select best match for a normalized stem and lowercased extension:
+    1. exact stem + extension match
+    2. exact stem match
+    3. first non-excluded candidate
+    4. first candidate
+    """
+    return (
+        index.by_stem_ext.get((target_stem, target_ext))
+        or index.by_stem.get(target_stem)
+        or index.first_non_excluded
+        or index.first
+    )
 
 
 # ---------------------------
 # Download Helpers
 # ---------------------------
 
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
 EXPORT_MIME_MAP = {
     "application/vnd.google-apps.document": (
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
@@ -234,6 +565,31 @@ EXPORT_MIME_MAP = {
 }
 
 
+def is_complete_local_copy(service, file_id: str, local_path: Path) -> bool:
+    """
+    Return True if local_path already exists with the same size as the Drive file.
+    Drive is only asked for the size when a local file is present; if that
+    lookup fails the file is simply downloaded again.
+    """
+    if not local_path.exists():
+        return False
+
+    try:
+        meta = service.files().get(fileId=file_id, fields="size").execute()
+        size = meta.get("size")
+        return size is not None and local_path.stat().st_size == int(size)
+    except Exception:
+        return False
+
+
+def local_download_path(file_name: str, company: str, base_folder: str, mime_type: str) -> Path:
+    """Return where download_file saves a file (exports get their default extension)."""
+    company_dir = Path(base_folder) / sanitize_folder_name(company)
+    if mime_type in EXPORT_MIME_MAP and not Path(file_name).suffix:
+        return company_dir / f"{file_name}{EXPORT_MIME_MAP[mime_type][1]}"
+    return company_dir / file_name
+
+
 def download_file(
     service,
     file_id: str,
@@ -245,21 +601,23 @@ def download_file(
     """
     Download one file into base_folder/company/.
     Uses export_media for Google-native files and get_media for regular files.
+    Regular files already downloaded with a matching size are skipped.
     """
-    company_dir = Path(base_folder) / sanitize_folder_name(company)
-    ensure_folder(company_dir)
+    from googleapiclient.http import MediaIoBaseDownload
+
+    local_path = local_download_path(file_name, company, base_folder, mime_type)
+    ensure_folder(local_path.parent)
 
     if mime_type in EXPORT_MIME_MAP:
-        export_mime, default_ext = EXPORT_MIME_MAP[mime_type]
-        local_name = file_name if Path(file_name).suffix else f"{file_name}{default_ext}"
-        local_path = company_dir / local_name
+        export_mime, _ = EXPORT_MIME_MAP[mime_type]
         request = service.files().export_media(fileId=file_id, mimeType=export_mime)
     else:
-        local_path = company_dir / file_name
+        if is_complete_local_copy(service, file_id, local_path):
+            return local_path
         request = service.files().get_media(fileId=file_id)
 
     with io.FileIO(local_path, "wb") as fh:
-        downloader = MediaIoBaseDownload(fh, request)
+        downloader = MediaIoBaseDownload(fh, request, chunksize=DOWNLOAD_CHUNK_SIZE)
         done = False
         while not done:
             _, done = downloader.next_chunk()
@@ -267,6 +625,47 @@ def download_file(
     return local_path
 
 
+def download_files_concurrently(
+    services: DriveServicePool,
+    files: List[Dict],
+    base_folder: str,
+    max_workers: int = 8
+) -> Iterator[Tuple[Dict, Optional[Exception]]]:
+    """
+    Download files on a thread pool, yielding (file, error) as each one finishes.
+    Each job borrows its own Drive service from the pool.
+    Entries resolving to the same local path are downloaded once, and every
+    one of them is reported with that download's outcome.
+    """
+    def worker(file: Dict) -> Path:
+        with services.service() as service:
+            return download_file(
+                service=service,
+                file_id=file["file_id"],
+                file_name=file["file_name"],
+                company=file["company"],
+                base_folder=base_folder,
+                mime_type=file["mimeType"],
+            )
+
+    by_path: Dict[Path, List[Dict]] = defaultdict(list)
+    for file in files:
+        path = local_download_path(file["file_name"], file["company"], base_folder, file["mimeType"])
+        by_path[path].append(file)
+
+    # not a with-block: on a Streamlit rerun/stop the generator is closed and
+    # queued downloads must be cancelled rather than waited for
+    pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)))
+    try:
+        futures = {pool.submit(worker, group[0]): group for group in by_path.values()}
+        for future in as_completed(futures):
+            error = future.exception()
+            for file in futures[future]:
+                yield file, error
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 def collect_download_list(results: List[Dict]) -> List[Dict]:
     """Return only found rows needed for downloading."""
     return [
@@ -286,8 +685,23 @@ def collect_download_list(results: List[Dict]) -> List[Dict]:
 # ---------------------------
 
 def read_input_excel(file) -> pd.DataFrame:
-    """Read uploaded Excel file; it must contain columns: filename, company."""
-    df = pd.read_excel(file)
+    """
+    Read uploaded Excel file; it must contain columns: filename, company.
+    Uses the calamine engine when available, else pandas' default engine.
+    """
+    import pandas as pd
+
+    read_kwargs = {
+        "usecols": lambda c: str(c).strip().lower() in ("filename", "company"),
+        "dtype": str,
+    }
+    try:
+        df = pd.read_excel(file, engine="calamine", **read_kwargs)
+    except (ImportError, ValueError):
+        # pandas < 2.2 or python-calamine not installed
+        if hasattr(file, "seek"):
+            file.seek(0)
+        df = pd.read_excel(file, **read_kwargs)
 
     cols = {str(c).strip().lower(): c for c in df.columns}
     if "filename" not in cols or "company" not in cols:
@@ -298,91 +712,189 @@ def read_input_excel(file) -> pd.DataFrame:
         cols["company"]: "company"
     })
 
-    df["filename"] = df["filename"].astype(str).str.strip()
-    df["company"] = df["company"].astype(str).str.strip()
+    df["filename"] = df["filename"].fillna("").astype(str).str.strip()
+    df["company"] = df["company"].fillna("").astype(str).str.strip()
 
     # remove empty rows
     df = df[(df["filename"] != "") & (df["company"] != "")]
     return df[["filename", "company"]]
 
 
-def write_results_excel(results: List[Dict], out_path: Path) -> None:
-    """Write results workbook with one sheet per company."""
+RESULT_COLUMNS = [
+    "company",
+    "input_filename",
+    "status",
+    "file_name",
+    "file_id",
+    "mimeType",
+    "webViewLink",
+    "error_message",
+]
+
+
+def group_by_company(results: List[Dict]) -> Dict[str, List[Dict]]:
+    """Group result rows by company, keeping first-seen company order."""
     by_company: Dict[str, List[Dict]] = defaultdict(list)
     for row in results:
         by_company[row["company"]].append(row)
+    return by_company
+
+
+def write_results_excel(results: List[Dict], out_path: Path) -> None:
+    """Write results workbook with one sheet per company."""
+    from openpyxl import Workbook
 
     ensure_folder(out_path.parent)
 
-    with pd.ExcelWriter(out_path, engine="openpyxl") as writer:
-        for company, rows in by_company.items():
-            df = pd.DataFrame(rows)
-
-            preferred_cols = [
-                "company",
-                "input_filename",
-                "status",
-                "file_name",
-                "file_id",
-                "mimeType",
-                "webViewLink",
-                "error_message",
-            ]
-            cols = [c for c in preferred_cols if c in df.columns]
-            df[cols].to_excel(
-                writer,
-                index=False,
-                sheet_name=sanitize_sheet_name(company)
-            )
+    # write-only mode streams rows to disk instead of building a cell model
+    wb = Workbook(write_only=True)
+    for company, rows in group_by_company(results).items():
+        ws = wb.create_sheet(title=sanitize_sheet_name(company))
+        ws.append(RESULT_COLUMNS)
+        for r in rows:
+            ws.append(tuple(r.get(c, "") for c in RESULT_COLUMNS))
+
+    wb.save(out_path)
+
+
+def write_results_csv_zip(results: List[Dict], out_path: Path) -> Path:
+    """
+    Write a zip with one CSV per company next to out_path (same name, .zip suffix).
+    Much faster than building a workbook for large result sets.
+    """
+    zip_path = out_path.with_suffix(".zip")
+    ensure_folder(zip_path.parent)
+
+    used_names = set()
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for company, rows in group_by_company(results).items():
+            base = sanitize_folder_name(company)
+            name, n = f"{base}.csv", 1
+            while name in used_names:
+                n += 1
+                name = f"{base}_{n}.csv"
+            used_names.add(name)
+
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            writer.writerow(RESULT_COLUMNS)
+            writer.writerows(tuple(r.get(c, "") for c in RESULT_COLUMNS) for r in rows)
+            zf.writestr(name, buf.getvalue())
+
+    return zip_path
 
 
 # ---------------------------
 # Core Processing
 # ---------------------------
 
-def process_search(service, df: pd.DataFrame, exclusion_suffixes: List[str]) -> List[Dict]:
-    """Search Drive for each filename and return row-wise results."""
-    results: List[Dict] = []
+def empty_result_row(filename: str, company: str) -> Dict:
+    """Return a result row with the default "Not Found" status."""
+    return {
+        "company": company,
+        "input_filename": filename,
+        "status": "Not Found",
+        "file_name": "",
+        "file_id": "",
+        "mimeType": "",
+        "webViewLink": "",
+        "error_message": "",
+    }
 
+
+def build_result_row(filename: str, company: str, match: Optional[Dict], error: str) -> Dict:
+    """Return the result row for one input row given its best match (or search error)."""
+    row_out = empty_result_row(filename, company)
+
+    if error:
+        row_out["status"] = "Error"
+        row_out["error_message"] = error
+    elif match:
+        row_out.update({
+            "status": "Found",
+            "file_name": match.get("name", ""),
+            "file_id": match.get("id", ""),
+            "mimeType": match.get("mimeType", ""),
+            "webViewLink": match.get("webViewLink", ""),
+        })
+
+    return row_out
+
+
+def process_search(
+    services: DriveServicePool,
+    df: pd.DataFrame,
+    exclusion_suffixes: Tuple[str, ...],
+    max_workers: int = 5,
+    cache: Optional[SearchCache] = None
+) -> List[Dict]:
+    """
+    Search Drive for each filename and return row-wise results.
+    Each distinct normalized stem is searched once. Stems safe to OR-group are
+    split into chunks of SEARCH_BATCH_SIZE (one query each), the rest into
+    chunks of DRIVE_BATCH_LIMIT (one batch request each); chunks are searched
+    concurrently, then the candidates are fanned out to every input row
+    sharing the stem. Results keep the input order.
+    """
     progress_bar = st.progress(0.0, text="Searching on Google Drive...")
 
-    total = len(df)
-    for i, row in enumerate(df.itertuples(index=False), start=1):
-        filename = str(row.filename).strip()
-        company = str(row.company).strip()
-
-        row_out = {
-            "company": company,
-            "input_filename": filename,
-            "status": "Not Found",
-            "file_name": "",
-            "file_id": "",
-            "mimeType": "",
-            "webViewLink": "",
-            "error_message": "",
-        }
+    norms, exts = split_normalized_names(df["filename"])
+    rows = list(zip(
+        df["filename"].fillna("").astype(str).str.strip(),
+        df["company"].fillna("").astype(str).str.strip(),
+        norms,
+        exts,
+    ))
+    keys = list(dict.fromkeys(norms))
+    grouped = [key for key in keys if is_or_groupable(key)]
+    single = [key for key in keys if not is_or_groupable(key)]
+    chunks = [
+        grouped[start:start + SEARCH_BATCH_SIZE]
+        for start in range(0, len(grouped), SEARCH_BATCH_SIZE)
+    ] + [
+        single[start:start + DRIVE_BATCH_LIMIT]
+        for start in range(0, len(single), DRIVE_BATCH_LIMIT)
+    ]
 
-        try:
-            candidates = drive_search_by_name(service, filename)
-            match = best_match_from_candidates(filename, candidates, exclusion_suffixes)
-
-            if match:
-                row_out.update({
-                    "status": "Found",
-                    "file_name": match.get("name", ""),
-                    "file_id": match.get("id", ""),
-                    "mimeType": match.get("mimeType", ""),
-                    "webViewLink": match.get("webViewLink", ""),
-                })
+    total = len(keys)
+    found: Dict[str, Tuple[List[Dict], str]] = {}
+    done = 0
 
+    def worker(chunk: List[str]) -> Dict[str, Tuple[List[Dict], str]]:
+        # an unexpected failure only marks this chunk's rows as errors
+        try:
+            with services.service() as service:
+                return search_candidates(service, chunk, cache)
         except Exception as e:
-            row_out["status"] = "Error"
-            row_out["error_message"] = str(e)
+            return {key: ([], str(e)) for key in chunk}
 
-        results.append(row_out)
-        progress_bar.progress(i / total, text=f"Searching on Google Drive... ({i}/{total})")
+    # cancel queued chunks instead of waiting for them if Streamlit stops the script
+    pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)))
+    try:
+        futures = [pool.submit(worker, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            chunk_found = future.result()
+            found.update(chunk_found)
+            done += len(chunk_found)
+            progress_bar.progress(done / total, text=f"Searching on Google Drive... ({done}/{total})")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
     progress_bar.empty()
+
+    # index each candidate list once; rows sharing a stem reuse it
+    indexes = {
+        key: index_candidates(files, exclusion_suffixes)
+        for key, (files, error) in found.items()
+        if not error
+    }
+    empty_index = index_candidates([], exclusion_suffixes)
+
+    results: List[Dict] = []
+    for filename, company, norm, ext in rows:
+        error = found.get(norm, ([], ""))[1]
+        match = None if error else best_match_for_target(norm, ext, indexes.get(norm, empty_index))
+        results.append(build_result_row(filename, company, match, error))
     return results
 
 
@@ -393,7 +905,7 @@ def process_search(service, df: pd.DataFrame, exclusion_suffixes: List[str]) ->
 def init_session_state():
     """Initialize Streamlit session state keys."""
     defaults = {
-        "service": None,
+        "services": None,
         "results": None,
         "config": None,
         "input_df": None,
@@ -440,6 +952,13 @@ def ui():
         "Results Excel file path",
         value=st.session_state.last_output_path or default_out
     )
+    output_format = st.radio(
+        "Output format",
+        ["xlsx", "csv (zip)"],
+        horizontal=True,
+        help="csv (zip) writes one CSV per company into a .zip next to the path above; "
+             "it is much faster for large result sets.",
+    )
 
     st.subheader("3) Download settings")
     download_folder = st.text_input(
@@ -450,7 +969,13 @@ def ui():
 
     st.divider()
 
-    run_search = st.button("▶️ Run Search")
+    col_run, col_refresh = st.columns([1, 2])
+    run_search = col_run.button("▶️ Run Search")
+    refresh_cache = col_refresh.checkbox(
+        "Refresh cached search results",
+        value=False,
+        help="Ignore cached Drive search results and search Drive again for every filename.",
+    )
 
     if run_search:
         if not uploaded:
@@ -466,45 +991,60 @@ def ui():
 
         with st.status("Authorizing with Google...", expanded=False) as status_box:
             try:
-                creds = get_credentials(
-                    token_file=st.session_state.config["token_file"],
+                token_path = Path(st.session_state.config["token_file"])
+                st.session_state.services = get_drive_services(
+                    token_file=str(token_path),
                     credentials_file=st.session_state.config["credentials_file"],
-                    scopes=st.session_state.config["scopes"],
+                    scopes=tuple(st.session_state.config["scopes"]),
+                    token_mtime=token_path.stat().st_mtime if token_path.exists() else None,
                 )
-                service = build_drive_service(creds)
-                st.session_state.service = service
                 status_box.update(label="Authorization complete ✅", state="complete")
             except Exception as e:
+                get_drive_services.clear()
+                st.session_state.services = None
                 status_box.update(label=f"Authorization failed: {e}", state="error")
                 st.stop()
 
         with st.status("Searching files on Drive...", expanded=False) as status_box:
             try:
                 results = process_search(
-                    st.session_state.service,
+                    st.session_state.services,
                     st.session_state.input_df,
                     st.session_state.config["exclusion_suffixes"],
+                    max_workers=st.session_state.config["search_workers"],
+                    cache=SearchCache(
+                        st.session_state.config["cache_file"],
+                        st.session_state.config["cache_ttl_seconds"],
+                        refresh=refresh_cache,
+                    ),
                 )
                 st.session_state.results = results
                 st.session_state.last_output_path = out_path_str
+                if results and all(r["status"] == "Error" for r in results):
+                    # most likely a revoked or expired token: re-authorize next run
+                    get_drive_services.clear()
+                    st.session_state.services = None
                 status_box.update(label="Search completed ✅", state="complete")
             except Exception as e:
                 status_box.update(label=f"Search failed: {e}", state="error")
                 st.stop()
 
         try:
-            write_results_excel(st.session_state.results, Path(out_path_str))
-            st.success(f"Results workbook written to: {out_path_str}")
+            if output_format == "csv (zip)":
+                zip_path = write_results_csv_zip(st.session_state.results, Path(out_path_str))
+                st.success(f"Results CSVs written to: {zip_path}")
+            else:
+                write_results_excel(st.session_state.results, Path(out_path_str))
+                st.success(f"Results workbook written to: {out_path_str}")
         except Exception as e:
-            st.error(f"Failed to write results Excel: {e}")
+            st.error(f"Failed to write results: {e}")
 
     # Show existing results after reruns
     if st.session_state.results:
-        res_df = pd.DataFrame(st.session_state.results)
-
-        found_count = int((res_df["status"] == "Found").sum())
-        not_found_count = int((res_df["status"] == "Not Found").sum())
-        error_count = int((res_df["status"] == "Error").sum())
+        status_counts = Counter(r["status"] for r in st.session_state.results)
+        found_count = status_counts["Found"]
+        not_found_count = status_counts["Not Found"]
+        error_count = status_counts["Error"]
 
         st.subheader("Results Summary")
         col1, col2, col3 = st.columns(3)
@@ -512,11 +1052,11 @@ def ui():
         col2.metric("Not Found", not_found_count)
         col3.metric("Errors", error_count)
 
-        st.dataframe(res_df, use_container_width=True)
+        st.dataframe(st.session_state.results, use_container_width=True)
 
         if do_download and found_count > 0:
             if st.button("⬇️ Download All Found Files"):
-                if st.session_state.service is None:
+                if st.session_state.services is None:
                     st.error("Google Drive service is not available. Please run the search again.")
                     st.stop()
 
@@ -532,20 +1072,20 @@ def ui():
                 downloaded = 0
                 failed = 0
 
-                for i, file in enumerate(to_download, start=1):
-                    try:
-                        download_file(
-                            service=st.session_state.service,
-                            file_id=file["file_id"],
-                            file_name=file["file_name"],
-                            company=file["company"],
-                            base_folder=download_folder,
-                            mime_type=file["mimeType"],
-                        )
+                for i, (file, error) in enumerate(
+                    download_files_concurrently(
+                        services=st.session_state.services,
+                        files=to_download,
+                        base_folder=download_folder,
+                        max_workers=st.session_state.config["download_workers"],
+                    ),
+                    start=1,
+                ):
+                    if error is None:
                         downloaded += 1
-                    except Exception as e:
+                    else:
                         failed += 1
-                        st.warning(f"Failed to download '{file['file_name']}': {e}")
+                        st.warning(f"Failed to download '{file['file_name']}': {error}")
 
                     progress_bar.progress(i / total)
 
@@ -0,0 +1,198 @@
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import app  # noqa: E402
+
+
+class FakeRequest:
+    def __init__(self, drive, kwargs):
+        self.drive = drive
+        self.kwargs = kwargs
+
+    def execute(self):
+        self.drive.calls.append(self.kwargs["q"])
+        terms = [
+            t.replace('\\"', '"').replace("\\\\", "\\").lower()
+            for t in re.findall(r'name contains "((?:[^"\\]|\\.)*)"', self.kwargs["q"])
+        ]
+        matches = [
+            f for f in self.drive.files_data
+            if any(re.search(r"(?<![^\W_])" + re.escape(t), f["name"].lower()) for t in terms)
+        ]
+        start = int(self.kwargs.get("pageToken") or 0)
+        end = start + self.kwargs["pageSize"]
+        out = {"files": matches[start:end]}
+        if end < len(matches) and "nextPageToken" in self.kwargs["fields"]:
+            out["nextPageToken"] = str(end)
+        return out
+
+
+class FakeBatch:
+    def __init__(self, drive, callback):
+        self.drive = drive
+        self.callback = callback
+        self.items = []
+
+    def add(self, request, request_id):
+        self.items.append((request, request_id))
+
+    def execute(self):
+        self.drive.batches.append(len(self.items))
+        for request, request_id in self.items:
+            self.callback(request_id, request.execute(), None)
+
+
+class FakeFiles:
+    def __init__(self, drive):
+        self.drive = drive
+
+    def list(self, **kwargs):
+        return FakeRequest(self.drive, kwargs)
+
+
+class FakeDrive:
+    """Minimal stand-in for the Drive v3 service (word-prefix name matching)."""
+
+    def __init__(self, names):
+        self.files_data = [{"id": str(i), "name": n} for i, n in enumerate(names)]
+        self.calls = []
+        self.batches = []
+
+    def files(self):
+        return FakeFiles(self)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+def test_generic_key_does_not_starve_other_keys_in_chunk():
+    names = [f"invoice {i}.pdf" for i in range(2000)] + ["zeta report.pdf"]
+    drive = FakeDrive(names)
+    keys = ["invoice"] + [f"other {i}" for i in range(23)] + ["zeta report"]
+
+    out = app.search_candidates(drive, keys)
+
+    assert [f["name"] for f in out["zeta report"][0]] == ["zeta report.pdf"]
+    assert len(out["invoice"][0]) == app.MAX_CANDIDATES_PER_NAME
+    assert all(error == "" for _, error in out.values())
+
+
+def test_bucket_candidates_only_matches_word_prefixes():
+    files = [
+        {"id": "1", "name": "Report.pdf"},
+        {"id": "2", "name": "Q1 port_plan.xlsx"},
+        {"id": "3", "name": "annual_report (1).pdf"},
+    ]
+
+    buckets = app.bucket_candidates(["port", "report"], files)
+
+    assert [f["id"] for f in buckets["port"]] == ["2"]
+    assert [f["id"] for f in buckets["report"]] == ["1", "3"]
+
+
+def test_key_not_found_when_only_substring_matches_share_the_chunk():
+    drive = FakeDrive(["report.pdf"])
+
+    out = app.search_candidates(drive, ["port", "report"])
+
+    assert out["port"] == ([], "")
+    assert [f["name"] for f in out["report"][0]] == ["report.pdf"]
+
+
+def test_empty_and_truncated_results_are_not_cached(tmp_path):
+    names = [f"invoice {i}.pdf" for i in range(100)] + ["zeta report.pdf"]
+    cache = app.SearchCache(str(tmp_path / "cache.sqlite"), ttl_seconds=3600)
+
+    app.search_candidates(FakeDrive(names), ["invoice", "missing", "zeta report"], cache)
+
+    # "invoice" came from a cut-off OR query, "missing" found nothing
+    assert set(cache.get_many(["invoice", "missing", "zeta report"])) == {"zeta report"}
+
+
+def test_refresh_skips_cache_reads_but_stores_results(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    app.SearchCache(path, 3600).put_many({"report": [{"id": "old", "name": "report.pdf"}]})
+
+    refreshing = app.SearchCache(path, 3600, refresh=True)
+    out = app.search_candidates(FakeDrive(["report.pdf"]), ["report"], refreshing)
+
+    assert out["report"][0] == [{"id": "0", "name": "report.pdf"}]
+    assert app.SearchCache(path, 3600).get_many(["report"])["report"][0]["id"] == "0"
+
+
+class FakeProgress:
+    def progress(self, *args, **kwargs):
+        pass
+
+    def empty(self):
+        pass
+
+
+def test_process_search_sends_unsafe_names_in_full_batches(monkeypatch):
+    import pandas as pd
+
+    names = [f'file "{i}".pdf' for i in range(150)] + [f"plain {i}.pdf" for i in range(30)]
+    drive = FakeDrive(names)
+    pool = app.DriveServicePool(None)
+    monkeypatch.setattr(app, "build_drive_service", lambda creds: drive)
+    monkeypatch.setattr(app.st, "progress", lambda *a, **k: FakeProgress())
+    df = pd.DataFrame({"filename": names, "company": "Acme"})
+
+    results = app.process_search(pool, df, ("_old",), max_workers=1)
+
+    assert sorted(drive.batches) == [50, 100]
+    assert sum(1 for q in drive.calls if " or " in q) == 2
+    assert [r["file_name"] for r in results] == names
+
+
+def test_size_check_failure_falls_back_to_download(tmp_path):
+    class FailingGet:
+        def execute(self):
+            raise RuntimeError("quota exceeded")
+
+    class Files:
+        def get(self, **kwargs):
+            return FailingGet()
+
+    class Service:
+        def files(self):
+            return Files()
+
+    local = tmp_path / "report.pdf"
+    local.write_bytes(b"data")
+
+    assert app.is_complete_local_copy(Service(), "1", local) is False
+
+
+def test_closing_download_generator_cancels_queued_downloads(monkeypatch):
+    import threading
+    import time
+
+    release = threading.Event()
+    started = []
+
+    def fake_download(**kwargs):
+        started.append(kwargs["file_id"])
+        if kwargs["file_id"] != "0":
+            release.wait(5)
+
+    monkeypatch.setattr(app, "build_drive_service", lambda creds: object())
+    monkeypatch.setattr(app, "download_file", fake_download)
+    files = [
+        {"company": "Acme", "file_id": str(i), "file_name": f"f{i}.pdf", "mimeType": ""}
+        for i in range(10)
+    ]
+
+    gen = app.download_files_concurrently(app.DriveServicePool(None), files, "unused", max_workers=2)
+    next(gen)
+    t0 = time.monotonic()
+    gen.close()
+    elapsed = time.monotonic() - t0
+    release.set()
+
+    assert elapsed < 1
+    time.sleep(0.1)
+    assert len(started) < len(files)